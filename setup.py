@@ -1,66 +1,124 @@
-import codecs
-import glob
+import io
 import os
+import sys
 
-from setuptools import find_packages, setup
+from setuptools import setup
 
 
-# Prevent spurious errors during `python setup.py test`, a la
-# http://www.eby-sarna.com/pipermail/peak/2010-May/003357.html:
-try:
-    import multiprocessing
-except ImportError:
-    pass
+HERE = os.path.abspath(os.path.dirname(__file__))
+
+# Explicit list so setup() doesn't walk the whole source tree on every
+# invocation. Keep in sync with the package directories on disk.
+PACKAGES = [
+    'socorro',
+    'socorro.app',
+    'socorro.cron',
+    'socorro.cron.jobs',
+    'socorro.database',
+    'socorro.external',
+    'socorro.external.boto',
+    'socorro.external.es',
+    'socorro.external.fs',
+    'socorro.external.http',
+    'socorro.external.postgresql',
+    'socorro.external.rabbitmq',
+    'socorro.external.statsd',
+    'socorro.lib',
+    'socorro.processor',
+    'socorro.processor.rules',
+    'socorro.schemas',
+    'socorro.scripts',
+    'socorro.siglists',
+    'socorro.signature',
+    'socorro.submitter',
+    'socorro.unittest',
+    'socorro.unittest.app',
+    'socorro.unittest.cron',
+    'socorro.unittest.cron.jobs',
+    'socorro.unittest.database',
+    'socorro.unittest.external',
+    'socorro.unittest.external.boto',
+    'socorro.unittest.external.es',
+    'socorro.unittest.external.fs',
+    'socorro.unittest.external.http',
+    'socorro.unittest.external.postgresql',
+    'socorro.unittest.external.rabbitmq',
+    'socorro.unittest.external.statsd',
+    'socorro.unittest.lib',
+    'socorro.unittest.middleware',
+    'socorro.unittest.processor',
+    'socorro.unittest.processor.rules',
+    'socorro.unittest.scripts',
+    'socorro.unittest.siglists',
+    'socorro.unittest.signature',
+    'socorro.unittest.submitter',
+    'tools',
+    'wsgi',
+]
+
+
+# Commands that never look at the long description.
+NO_LONG_DESCRIPTION_COMMANDS = {'--help', '--version', 'clean'}
 
 
 def read(fname):
-    fpath = os.path.join(os.path.dirname(__file__), fname)
-    with codecs.open(fpath, 'r', 'utf8') as f:
+    with io.open(os.path.join(HERE, fname), encoding='utf-8') as f:
         return f.read().strip()
 
 
-setup(
-    name='socorro',
-    version='master',
-    description=('Socorro is a server to accept and process Breakpad'
-                 ' crash reports.'),
-    long_description=open('README.rst').read(),
-    author='Mozilla',
-    author_email='socorro-dev@mozilla.com',
-    license='MPL',
-    url='https://github.com/mozilla/socorro',
-    classifiers=[
-        'Intended Audience :: Developers',
-        'Intended Audience :: System Administrators',
-        'License :: OSI Approved :: MPL License',
-        'Programming Language :: Python :: 2.7',
-        'Topic :: Internet :: WWW/HTTP :: WSGI :: Application',
-    ],
-    keywords=['socorro', 'breakpad', 'crash', 'reporting', 'minidump',
-              'stacktrace'],
-    packages=find_packages(),
-    install_requires=[],  # use pip -r requirements.txt instead
-    entry_points={
-        'console_scripts': [
-            'socorro = socorro.app.socorro_app:SocorroWelcomeApp.run'
+if __name__ == '__main__':
+    setup(
+        name='socorro',
+        version='master',
+        description=('Socorro is a server to accept and process Breakpad'
+                     ' crash reports.'),
+        long_description=(
+            '' if NO_LONG_DESCRIPTION_COMMANDS & set(sys.argv)
+            else read('README.rst')
+        ),
+        author='Mozilla',
+        author_email='socorro-dev@mozilla.com',
+        license='MPL',
+        url='https://github.com/mozilla/socorro',
+        classifiers=[
+            'Intended Audience :: Developers',
+            'Intended Audience :: System Administrators',
+            'License :: OSI Approved :: MPL License',
+            'Programming Language :: Python :: 2',
+            'Programming Language :: Python :: 2 :: Only',
+            'Programming Language :: Python :: 2.7',
+            'Topic :: Internet :: WWW/HTTP :: WSGI :: Application',
+        ],
+        keywords=['socorro', 'breakpad', 'crash', 'reporting', 'minidump',
+                  'stacktrace'],
+        packages=PACKAGES,
+        python_requires='>=2.7, <3',
+        install_requires=[],  # use pip -r requirements.txt instead
+        entry_points={
+            'console_scripts': [
+                'socorro = socorro.app.socorro_app:SocorroWelcomeApp.run'
+            ],
+        },
+        test_suite='nose.collector',
+        zip_safe=False,
+        include_package_data=True,
+        package_data={
+            'socorro.external.postgresql': [
+                'raw_sql/procs/*.sql',
+                'raw_sql/views/*.sql',
+                'raw_sql/types/*.sql',
+            ],
+            'socorro.siglists': ['*.txt'],
+            'socorro.schemas': ['*.json'],
+        },
+        # These are generated at the top of the checkout at build time, so they
+        # live outside the package and can't be package_data.
+        data_files=[
+            ('socorro', [
+                'socorro_revision.txt',
+                'breakpad_revision.txt',
+                'JENKINS_BUILD_NUMBER'
+            ]),
         ],
-    },
-    test_suite='nose.collector',
-    zip_safe=False,
-    data_files=[
-        ('socorro/external/postgresql/raw_sql/procs',
-            glob.glob('socorro/external/postgresql/raw_sql/procs/*.sql')),
-        ('socorro/external/postgresql/raw_sql/views',
-            glob.glob('socorro/external/postgresql/raw_sql/views/*.sql')),
-        ('socorro/external/postgresql/raw_sql/types',
-            glob.glob('socorro/external/postgresql/raw_sql/types/*.sql')),
-        ('socorro', [
-            'socorro_revision.txt',
-            'breakpad_revision.txt',
-            'JENKINS_BUILD_NUMBER'
-        ]),
-        ('socorro/siglists', glob.glob('socorro/siglists/*.txt')),
-        ('socorro/schemas', glob.glob('socorro/schemas/*.json')),
-    ],
-)
-assert glob.glob('socorro/schemas/*.json') # TEMP
+    )
+    assert any(f.endswith('.json') for f in os.listdir('socorro/schemas'))  # TEMP
@@ -52,6 +52,10 @@ class IndexCleaner(RequiredConfig):
 
         aliases = index_client.get_aliases()
 
+        index_regex = re.compile(
+            self.config.elasticsearch.elasticsearch_index_regex
+        )
+
         for index in indices:
             # Some indices look like 'socorro%Y%W_%Y%M%d', but they are
             # aliased to the expected format of 'socorro%Y%W'. In such cases,
@@ -61,10 +65,7 @@ class IndexCleaner(RequiredConfig):
                 if index_aliases:
                     index = index_aliases[0]
 
-            if not re.match(
-                self.config.elasticsearch.elasticsearch_index_regex,
-                index
-            ):
+            if not index_regex.match(index):
                 # This index doesn't look like a crash index, let's skip it.
                 continue
 
@@ -2,7 +2,7 @@ from configman import RequiredConfig, Namespace, class_converter
 
 
 def _default_list_splitter(class_list_str):
-    return [x.strip() for x in class_list_str.split(',') if x.strip()]
+    return [x for x in (y.strip() for y in class_list_str.split(',')) if x]
 
 
 def _default_class_extractor(list_element):
@@ -31,6 +31,27 @@ def str_to_classes_in_namespaces_converter(
                           a classname from the result of the list_converter
     """
 
+    # the same class list string tends to get converted over and over (once
+    # for the default and once more for every value source that mentions
+    # it).  Splitting the string and importing the classes is the expensive
+    # part, so that is remembered here, keyed by the original string.  The
+    # InnerClassList itself is still built fresh on every call because
+    # configman sets values on the Options it holds.
+    resolved_class_lists = {}
+
+    def resolve_class_list(class_list_str):
+        try:
+            return resolved_class_lists[class_list_str]
+        except KeyError:
+            resolved = tuple(
+                (class_list_element, class_converter(
+                    class_extractor(class_list_element)
+                ))
+                for class_list_element in list_splitter_fn(class_list_str)
+            )
+            resolved_class_lists[class_list_str] = resolved
+            return resolved
+
     def class_list_converter(class_list_str):
         """This function becomes the actual converter used by configman to
         take a string and convert it into the nested sequence of Namespaces,
@@ -38,7 +59,7 @@ def str_to_classes_in_namespaces_converter(
         class stuffed with its own 'required_config' that's dynamically
         generated."""
         if isinstance(class_list_str, basestring):
-            class_str_list = list_splitter_fn(class_list_str)
+            resolved_class_list = resolve_class_list(class_list_str)
         else:
             raise TypeError('must be derivative of a basestring')
 
@@ -64,13 +85,9 @@ def str_to_classes_in_namespaces_converter(
 
             # for each class in the class list
             class_list = []
-            for namespace_index, class_list_element in enumerate(
-                class_str_list
+            for namespace_index, (class_list_element, a_class) in enumerate(
+                resolved_class_list
             ):
-                a_class = class_converter(
-                    class_extractor(class_list_element)
-                )
-
                 # figure out the Namespace name
                 namespace_name_dict = {
                     'name': a_class.__name__,
@@ -2,24 +2,91 @@
 # License, v. 2.0. If a copy of the MPL was not distributed with this
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
-from itertools import islice
 import logging
 import re
 
 import ujson
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
 from socorro import siglists
 from socorro.lib.treelib import tree_get
 
 
 SIGNATURE_MAX_LENGTH = 255
 MAXIMUM_FRAMES_TO_CONSIDER = 40
+MAXIMUM_NORMALIZED_FUNCTIONS_TO_CACHE = 100000
 SIGNATURE_ESCAPE_SINGLE_QUOTE = True
 
+ABORT_PREFIX = '###!!! ABORT:'
+ABORT_FILE_PREFIX = '###!!! ABORT: file '
+ABORT_FILE_SEPARATOR = ': file '
+
 
 logger = logging.getLogger(__name__)
 
 
+# The siglists are long and compiling them is expensive, so compiled
+# alternations are shared by every CSignatureTool in the process.
+_compiled_alternations = {}
+
+
+def _compile_alternation(patterns):
+    """Return a compiled regular expression matching any of ``patterns``
+
+    If the re2 library is installed, it's used to compile the alternation so
+    that matching a frame against hundreds of siglist entries runs in linear
+    time. Otherwise, or if re2 can't handle one of the patterns, this falls
+    back to the stdlib ``re`` module.
+
+    :arg patterns: sequence of regular expression strings
+
+    """
+    patterns = tuple(patterns)
+    try:
+        return _compiled_alternations[patterns]
+    except KeyError:
+        source = '|'.join(patterns)
+        compiled = None
+        if re2 is not None:
+            try:
+                compiled = re2.compile(source)
+            except re2.error:
+                logger.warning('re2 cannot compile siglist; using re instead')
+        if compiled is None:
+            compiled = re.compile(source)
+        _compiled_alternations[patterns] = compiled
+        return compiled
+
+
+# compiled character classes matching a pair of _collapse delimiters
+_delimiter_res = {}
+
+
+def _get_delimiter_re(open_string, close_string):
+    try:
+        return _delimiter_res[(open_string, close_string)]
+    except KeyError:
+        delimiter_re = re.compile(
+            '[%s%s]' % (re.escape(open_string), re.escape(close_string))
+        )
+        _delimiter_res[(open_string, close_string)] = delimiter_re
+        return delimiter_re
+
+
+# Removes spaces before stars, ampersands and commas, and ensures a space after
+# commas, in one pass. A comma only counts as already followed by a space if
+# that space isn't itself about to be removed.
+FIXUP_SPACING_RE = re.compile(r' (?=[\*&,])|,(?! (?![\*&,]))')
+
+
+def _fixup_spacing_replacement(match):
+    return '' if match.group() == ' ' else ', '
+
+
 class Rule(object):
     """Base class for Signature generation rules"""
     def predicate(self, raw_crash, processed_crash):
@@ -91,33 +158,45 @@ class CSignatureTool(SignatureTool):
     def __init__(self, quit_check_callback=None):
         super(CSignatureTool, self).__init__(quit_check_callback)
 
-        self.irrelevant_signature_re = re.compile(
-            '|'.join(siglists.IRRELEVANT_SIGNATURE_RE)
+        self.irrelevant_signature_re = _compile_alternation(
+            siglists.IRRELEVANT_SIGNATURE_RE
         )
-        self.prefix_signature_re = re.compile(
-            '|'.join(siglists.PREFIX_SIGNATURE_RE)
+        self.prefix_signature_re = _compile_alternation(
+            siglists.PREFIX_SIGNATURE_RE
         )
-        self.signatures_with_line_numbers_re = re.compile(
-            '|'.join(siglists.SIGNATURES_WITH_LINE_NUMBERS_RE)
+        self.signatures_with_line_numbers_re = _compile_alternation(
+            siglists.SIGNATURES_WITH_LINE_NUMBERS_RE
         )
-        self.trim_dll_signature_re = re.compile(
-            '|'.join(siglists.TRIM_DLL_SIGNATURE_RE)
+        self.trim_dll_signature_re = _compile_alternation(
+            siglists.TRIM_DLL_SIGNATURE_RE
         )
+        # _do_generate needs to know which of the irrelevant, trim dll and
+        # prefix lists a frame matches first, in that order, so they're
+        # fused into one regex with a named group per list to classify a
+        # frame in a single match
+        self.frame_classification_re = _compile_alternation((
+            '(?P<irrelevant>%s)' % '|'.join(siglists.IRRELEVANT_SIGNATURE_RE),
+            '(?P<trim_dll>%s)' % '|'.join(siglists.TRIM_DLL_SIGNATURE_RE),
+            '(?P<prefix>%s)' % '|'.join(siglists.PREFIX_SIGNATURE_RE),
+        ))
         self.signature_sentinels = siglists.SIGNATURE_SENTINELS
 
         self.collapse_arguments = True
 
-        self.fixup_space = re.compile(r' (?=[\*&,])')
-        self.fixup_comma = re.compile(r',(?! )')
+        self.fixup_spacing = FIXUP_SPACING_RE
+
+        # the same functions turn up in crash after crash, so keep the
+        # normalized forms around keyed by (function, line, collapse_arguments)
+        self._normalized_functions = {}
 
     @staticmethod
-    def _is_exception(exception_list, remaining_original_line, line_up_to_current_position):
-        for an_exception in exception_list:
-            if remaining_original_line.startswith(an_exception):
-                return True
-            if line_up_to_current_position.endswith(an_exception):
-                return True
-        return False
+    def _is_exception(exception_tuple, function_signature_str, index):
+        """whether one of the exceptions starts right after, or ends right
+        before, the delimiter at ``index``"""
+        return (
+            function_signature_str.startswith(exception_tuple, index + 1) or
+            function_signature_str.endswith(exception_tuple, 0, index)
+        )
 
     def _collapse(
         self,
@@ -137,36 +216,85 @@ class CSignatureTool(SignatureTool):
         target_counter = 0
         collapsed_list = []
         exception_mode = False
-
-        def append_if_not_in_collapse_mode(a_character):
+        exception_tuple = tuple(exception_substring_list)
+
+        # Only the delimiters change state, so jump from one to the next and
+        # copy the text between them in one piece when not collapsing.
+        segment_start = 0
+        delimiter_re = _get_delimiter_re(open_string, close_string)
+        for a_match in delimiter_re.finditer(function_signature_str):
+            index = a_match.start()
             if not target_counter:
-                collapsed_list.append(a_character)
-
-        for index, a_character in enumerate(function_signature_str):
-            if a_character == open_string:
-                if self._is_exception(
-                    exception_substring_list,
-                    function_signature_str[index + 1:],
-                    function_signature_str[:index]
-                ):
+                collapsed_list.append(function_signature_str[segment_start:index])
+            segment_start = index + 1
+
+            if function_signature_str[index] == open_string:
+                if self._is_exception(exception_tuple, function_signature_str, index):
                     exception_mode = True
-                    append_if_not_in_collapse_mode(a_character)
+                    if not target_counter:
+                        collapsed_list.append(open_string)
                     continue
-                append_if_not_in_collapse_mode(replacement_open_string)
+                if not target_counter:
+                    collapsed_list.append(replacement_open_string)
                 target_counter += 1
-            elif a_character == close_string:
-                if exception_mode:
-                    append_if_not_in_collapse_mode(a_character)
-                    exception_mode = False
-                else:
-                    target_counter -= 1
-                    append_if_not_in_collapse_mode(replacement_close_string)
+            elif exception_mode:
+                if not target_counter:
+                    collapsed_list.append(close_string)
+                exception_mode = False
             else:
-                append_if_not_in_collapse_mode(a_character)
+                target_counter -= 1
+                if not target_counter:
+                    collapsed_list.append(replacement_close_string)
+
+        if not target_counter:
+            collapsed_list.append(function_signature_str[segment_start:])
 
         edited_function = ''.join(collapsed_list)
         return edited_function
 
+    def _normalize_function(self, function, line):
+        """returns the normalized form of a frame's function name, from the
+        cache if it has been seen before"""
+        key = (function, line, self.collapse_arguments)
+        try:
+            return self._normalized_functions[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable line, don't bother caching it
+            return self._build_normalized_function(function, line)
+        if len(self._normalized_functions) >= MAXIMUM_NORMALIZED_FUNCTIONS_TO_CACHE:
+            self._normalized_functions.clear()
+        normalized = self._build_normalized_function(function, line)
+        self._normalized_functions[key] = normalized
+        return normalized
+
+    def _build_normalized_function(self, function, line):
+        function = self._collapse(
+            function,
+            '<',
+            '<',
+            '>',
+            'T>',
+            ('name omitted', 'IPC::ParamTraits')
+        )
+        if self.collapse_arguments:
+            function = self._collapse(
+                function,
+                '(',
+                '',
+                ')',
+                '',
+                ('anonymous namespace', 'operator')
+            )
+
+        if self.signatures_with_line_numbers_re.match(function):
+            function = "%s:%s" % (function, line)
+        # Remove spaces before all stars, ampersands, and commas and ensure a space after
+        # commas
+        function = self.fixup_spacing.sub(_fixup_spacing_replacement, function)
+        return function
+
     def normalize_signature(
         self,
         module=None,
@@ -189,38 +317,12 @@ class CSignatureTool(SignatureTool):
         if normalized is not None:
             return normalized
         if function:
-            function = self._collapse(
-                function,
-                '<',
-                '<',
-                '>',
-                'T>',
-                ('name omitted', 'IPC::ParamTraits')
-            )
-            if self.collapse_arguments:
-                function = self._collapse(
-                    function,
-                    '(',
-                    '',
-                    ')',
-                    '',
-                    ('anonymous namespace', 'operator')
-                )
-
-            if self.signatures_with_line_numbers_re.match(function):
-                function = "%s:%s" % (function, line)
-            # Remove spaces before all stars, ampersands, and commas
-            function = self.fixup_space.sub('', function)
-            # Ensure a space after commas
-            function = self.fixup_comma.sub(', ', function)
-            return function
+            return self._normalize_function(function, line)
         # if source is not None and source_line is not None:
         if file and line:
             filename = file.rstrip('/\\')
-            if '\\' in filename:
-                file = filename.rsplit('\\')[-1]
-            else:
-                file = filename.rsplit('/')[-1]
+            separator = '\\' if '\\' in filename else '/'
+            file = filename.rpartition(separator)[2]
             return '%s#%s' % (file, line)
         if not module and not module_offset and offset:
             return "@%s" % offset
@@ -239,29 +341,41 @@ class CSignatureTool(SignatureTool):
         signature_notes = []
 
         # shorten source_list to the first signatureSentinel
+        first_locations = {}
+        for index, a_signature in enumerate(source_list):
+            if a_signature not in first_locations:
+                first_locations[a_signature] = index
+
         sentinel_locations = []
         for a_sentinel in self.signature_sentinels:
             if type(a_sentinel) == tuple:
                 a_sentinel, condition_fn = a_sentinel
                 if not condition_fn(source_list):
                     continue
-            try:
-                sentinel_locations.append(source_list.index(a_sentinel))
-            except ValueError:
-                pass
+            if a_sentinel in first_locations:
+                sentinel_locations.append(first_locations[a_sentinel])
         if sentinel_locations:
             source_list = source_list[min(sentinel_locations):]
 
-        # Get all the relevant frame signatures.
+        # Get all the relevant frame signatures. Once the joined signature is
+        # longer than generate will keep, later frames can't change the
+        # result, so stop looking.
         new_signature_list = []
+        if hang_type:
+            signature_length = len(self.hang_prefixes[hang_type])
+        else:
+            signature_length = -len(delimiter)
         for a_signature in source_list:
+            match = self.frame_classification_re.match(a_signature)
+            frame_kind = match.lastgroup if match else None
+
             # If the signature matches the irrelevant signatures regex, skip to the next frame.
-            if self.irrelevant_signature_re.match(a_signature):
+            if frame_kind == 'irrelevant':
                 continue
 
             # If the signature matches the trim dll signatures regex, rewrite it to remove all but
             # the module name.
-            if self.trim_dll_signature_re.match(a_signature):
+            if frame_kind == 'trim_dll':
                 a_signature = a_signature.split('@')[0]
 
                 # If this trimmed DLL signature is the same as the previous frame's, we do not want
@@ -269,11 +383,17 @@ class CSignatureTool(SignatureTool):
                 if new_signature_list and a_signature == new_signature_list[-1]:
                     continue
 
+                # The trimmed signature is a new string, so it needs its own prefix check.
+                is_prefix = self.prefix_signature_re.match(a_signature)
+            else:
+                is_prefix = frame_kind == 'prefix'
+
             new_signature_list.append(a_signature)
+            signature_length += len(delimiter) + len(a_signature)
 
             # If the signature does not match the prefix signatures regex, then it is the last one
             # we add to the list.
-            if not self.prefix_signature_re.match(a_signature):
+            if not is_prefix or signature_length > SIGNATURE_MAX_LENGTH:
                 break
 
         # Add a special marker for hang crash reports.
@@ -338,8 +458,7 @@ class JavaSignatureTool(SignatureTool):
                 'JavaSignatureTool: stack trace line 1 is not in the expected format'
             )
         try:
-            java_method = re.sub(
-                self.java_line_number_killer,
+            java_method = self.java_line_number_killer.sub(
                 '.java)',
                 source_list[1]
             )
@@ -393,16 +512,26 @@ class SignatureGenerationRule(Rule):
 
     def _create_frame_list(self, crashing_thread_mapping, make_modules_lower_case=False):
         frame_signatures_list = []
-        for a_frame in islice(
-            crashing_thread_mapping.get('frames', {}),
-            MAXIMUM_FRAMES_TO_CONSIDER
-        ):
+        normalize_signature = self.c_signature_tool.normalize_signature
+        normalize_function = self.c_signature_tool._normalize_function
+        frames = crashing_thread_mapping.get('frames', [])
+        for a_frame in frames[:MAXIMUM_FRAMES_TO_CONSIDER]:
             if make_modules_lower_case and 'module' in a_frame:
                 a_frame['module'] = a_frame['module'].lower()
 
-            normalized_signature = self.c_signature_tool.normalize_signature(**a_frame)
-            if 'normalized' not in a_frame:
-                a_frame['normalized'] = normalized_signature
+            # Reprocessed crashes already have normalized frames, so skip
+            # building the kwargs and calling normalize_signature for those.
+            normalized_signature = a_frame.get('normalized')
+            if normalized_signature is None:
+                # Most frames have a function, so go straight to the
+                # function branch rather than through normalize_signature.
+                function = a_frame.get('function')
+                if function:
+                    normalized_signature = normalize_function(function, a_frame.get('line'))
+                else:
+                    normalized_signature = normalize_signature(**a_frame)
+                if 'normalized' not in a_frame:
+                    a_frame['normalized'] = normalized_signature
             frame_signatures_list.append(normalized_signature)
         return frame_signatures_list
 
@@ -424,16 +553,17 @@ class SignatureGenerationRule(Rule):
         # This isn't a Java crash, so figure out what we need and then generate a C signature
         crashed_thread = self._get_crashing_thread(processed_crash)
 
+        hang_type = processed_crash.get('hang_type', None)
+        if hang_type == 1:
+            # Force the signature to come from thread 0
+            signature_thread = 0
+        else:
+            signature_thread = crashed_thread
+
         try:
-            if processed_crash.get('hang_type', None) == 1:
-                # Force the signature to come from thread 0
+            if signature_thread is not None:
                 signature_list = self._create_frame_list(
-                    tree_get(processed_crash, 'json_dump.threads.[0]'),
-                    tree_get(processed_crash, 'json_dump.system_info.os') == 'Windows NT'
-                )
-            elif crashed_thread is not None:
-                signature_list = self._create_frame_list(
-                    tree_get(processed_crash, 'json_dump.threads.[%d]' % crashed_thread),
+                    tree_get(processed_crash, 'json_dump.threads')[signature_thread],
                     tree_get(processed_crash, 'json_dump.system_info.os') == 'Windows NT'
                 )
             else:
@@ -444,7 +574,7 @@ class SignatureGenerationRule(Rule):
 
         signature, signature_notes = self.c_signature_tool.generate(
             signature_list,
-            processed_crash.get('hang_type', None),
+            hang_type,
             crashed_thread,
         )
         processed_crash['proto_signature'] = ' | '.join(signature_list)
@@ -465,33 +595,33 @@ class OOMSignature(Rule):
         'AutoEnterOOMUnsafeRegion',
         'alloc::oom::oom',
     )
+    signature_fragments_re = re.compile(
+        '|'.join(re.escape(fragment) for fragment in signature_fragments)
+    )
 
     def predicate(self, raw_crash, processed_crash):
-        if raw_crash.get('OOMAllocationSize'):
+        if 'OOMAllocationSize' in raw_crash and raw_crash['OOMAllocationSize']:
             return True
 
         signature = processed_crash.get('signature', '')
         if not signature:
             return False
 
-        for a_signature_fragment in self.signature_fragments:
-            if a_signature_fragment in signature:
-                return True
-
-        return False
+        return bool(self.signature_fragments_re.search(signature))
 
     def action(self, raw_crash, processed_crash, notes):
-        processed_crash['original_signature'] = processed_crash['signature']
+        signature = processed_crash['signature']
+        processed_crash['original_signature'] = signature
         try:
             size = int(raw_crash['OOMAllocationSize'])
         except (TypeError, AttributeError, KeyError):
-            processed_crash['signature'] = "OOM | unknown | " + processed_crash['signature']
+            processed_crash['signature'] = "OOM | unknown | " + signature
             return True
 
         if size <= 262144:  # 256K
             processed_crash['signature'] = "OOM | small"
         else:
-            processed_crash['signature'] = "OOM | large | " + processed_crash['signature']
+            processed_crash['signature'] = "OOM | large | " + signature
         return True
 
 
@@ -500,38 +630,38 @@ class AbortSignature(Rule):
     tag Abort crashes"""
 
     def predicate(self, raw_crash, processed_crash):
-        return bool(raw_crash.get('AbortMessage'))
+        return 'AbortMessage' in raw_crash and bool(raw_crash['AbortMessage'])
 
     def action(self, raw_crash, processed_crash, notes):
-        processed_crash['original_signature'] = processed_crash['signature']
+        signature = processed_crash['signature']
+        processed_crash['original_signature'] = signature
         abort_message = raw_crash['AbortMessage']
 
-        if '###!!! ABORT: file ' in abort_message:
+        if ABORT_FILE_PREFIX in abort_message:
             # This is an abort message that contains no interesting
             # information. We just want to put the "Abort" marker in the
             # signature.
-            processed_crash['signature'] = 'Abort | {}'.format(processed_crash['signature'])
+            processed_crash['signature'] = 'Abort | %s' % signature
             return True
 
-        if '###!!! ABORT:' in abort_message:
+        _, separator, remainder = abort_message.partition(ABORT_PREFIX)
+        if separator:
             # Recent crash reports added some irrelevant information at the
             # beginning of the abort message. We want to remove that and keep
             # just the actual abort message.
-            abort_message = abort_message.split('###!!! ABORT:', 1)[1].strip()
+            abort_message = remainder.strip()
 
-        if ': file ' in abort_message:
+        remainder, separator, _ = abort_message.partition(ABORT_FILE_SEPARATOR)
+        if separator:
             # Abort messages contain a file name and a line number. Since
             # those are very likely to change between builds, we want to
             # remove those parts from the signature.
-            abort_message = abort_message.split(': file ', 1)[0].strip()
+            abort_message = remainder.strip()
 
         if len(abort_message) > 80:
             abort_message = abort_message[:77] + '...'
 
-        processed_crash['signature'] = 'Abort | {} | {}'.format(
-            abort_message,
-            processed_crash['signature']
-        )
+        processed_crash['signature'] = 'Abort | %s | %s' % (abort_message, signature)
 
         return True
 
@@ -605,7 +735,7 @@ class SignatureShutdownTimeout(Rule):
     crash"""
 
     def predicate(self, raw_crash, processed_crash):
-        return bool(raw_crash.get('AsyncShutdownTimeout'))
+        return 'AsyncShutdownTimeout' in raw_crash and bool(raw_crash['AsyncShutdownTimeout'])
 
     def action(self, raw_crash, processed_crash, notes):
         parts = ['AsyncShutdownTimeout']
@@ -660,7 +790,7 @@ class SignatureIPCChannelError(Rule):
     """replaces the signature if there is a IPC channel error in the crash"""
 
     def predicate(self, raw_crash, processed_crash):
-        return bool(raw_crash.get('ipc_channel_error'))
+        return 'ipc_channel_error' in raw_crash and bool(raw_crash['ipc_channel_error'])
 
     def action(self, raw_crash, processed_crash, notes):
         if raw_crash.get('additional_minidumps') == 'browser':
@@ -682,7 +812,7 @@ class SignatureIPCMessageName(Rule):
     """augments the signature if there is a IPC message name in the crash"""
 
     def predicate(self, raw_crash, processed_crash):
-        return bool(raw_crash.get('IPCMessageName'))
+        return 'IPCMessageName' in raw_crash and bool(raw_crash['IPCMessageName'])
 
     def action(self, raw_crash, processed_crash, notes):
         processed_crash['signature'] = '{} | IPC_Message_Name={}'.format(
@@ -3,7 +3,8 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 from configman import ConfigurationManager, RequiredConfig, Namespace
-from configman.converters import to_str
+from configman.converters import class_converter, to_str
+import mock
 import pytest
 
 from socorro.lib.converters import (
@@ -198,6 +199,31 @@ class TestConverters(TestCase):
             assert a_class_name == a_class.__name__
             assert ns_name == "%s_%02d" % (a_class_name, i)
 
+    def test_classes_in_namespaces_converter_resolves_once(self):
+        converter_fn = str_to_classes_in_namespaces_converter(
+            'class_%(name)s'
+        )
+        class_list_str = (
+            'socorro.unittest.lib.test_converters.Foo,'
+            'socorro.unittest.lib.test_converters.Bar'
+        )
+        with mock.patch(
+            'socorro.lib.converters.class_converter',
+            wraps=class_converter
+        ) as mocked_class_converter:
+            result_1 = converter_fn(class_list_str)
+            result_2 = converter_fn(class_list_str)
+            assert mocked_class_converter.call_count == 2
+
+        # each conversion still gets its own class and Namespaces
+        assert result_1 is not result_2
+        assert (
+            result_1.required_config.class_Foo is not
+            result_2.required_config.class_Foo
+        )
+        assert [x[1] for x in result_1.class_list] == [Foo, Bar]
+        assert [x[1] for x in result_2.class_list] == [Foo, Bar]
+
     def test_change_default(self):
         class Alpha(RequiredConfig):
             required_config = Namespace()
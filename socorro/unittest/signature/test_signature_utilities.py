@@ -54,8 +54,7 @@ class TestCSignatureTool:
         exp_irrelevant_signature_re = re.compile('ignored1')
         exp_prefix_signature_re = re.compile('pre1|pre2')
         exp_signatures_with_line_numbers_re = re.compile('fnNeedNumber')
-        fixup_space = re.compile(r' (?=[\*&,])')
-        fixup_comma = re.compile(r',(?! )')
+        fixup_spacing = re.compile(r' (?=[\*&,])|,(?! (?![\*&,]))')
 
         s = self.setup_config_c_sig_tool()
 
@@ -63,8 +62,31 @@ class TestCSignatureTool:
         assert exp_prefix_signature_re.pattern == s.prefix_signature_re.pattern
         assert exp_signatures_with_line_numbers_re.pattern == s.signatures_with_line_numbers_re.pattern  # noqa
 
-        assert fixup_space.pattern == s.fixup_space.pattern
-        assert fixup_comma.pattern == s.fixup_comma.pattern
+        assert fixup_spacing.pattern == s.fixup_spacing.pattern
+
+    def test_c_config_tool_init_reuses_compiled_siglists(self):
+        s1 = self.setup_config_c_sig_tool()
+        s2 = self.setup_config_c_sig_tool()
+        assert s1.irrelevant_signature_re is s2.irrelevant_signature_re
+        assert s1.prefix_signature_re is s2.prefix_signature_re
+
+        s3 = self.setup_config_c_sig_tool(pr=['pre3'])
+        assert s3.prefix_signature_re is not s1.prefix_signature_re
+        assert s3.prefix_signature_re.pattern == 'pre3'
+
+    def test_c_config_tool_init_falls_back_to_re(self):
+        class FakeRe2Error(Exception):
+            pass
+
+        with mock.patch(
+            'socorro.signature.signature_utilities.re2'
+        ) as mocked_re2:
+            mocked_re2.error = FakeRe2Error
+            mocked_re2.compile.side_effect = FakeRe2Error
+            s = self.setup_config_c_sig_tool(ig=['re2_fallback'])
+
+        assert isinstance(s.irrelevant_signature_re, type(re.compile('')))
+        assert s.irrelevant_signature_re.match('re2_fallback')
 
     def test_normalize_with_collapse_args(self):
         """test_normalize: bunch of variations"""
@@ -125,6 +147,26 @@ class TestCSignatureTool:
             r = s.normalize_signature(*args)
             assert e == r
 
+    def test_normalize_function_is_cached(self):
+        s = self.setup_config_c_sig_tool()
+        with mock.patch.object(
+            s,
+            '_build_normalized_function',
+            wraps=s._build_normalized_function
+        ) as mocked_build:
+            assert s.normalize_signature(function='f3(s,t,u)') == 'f3'
+            assert s.normalize_signature(function='f3(s,t,u)') == 'f3'
+            assert mocked_build.call_count == 1
+
+            # collapse_arguments is part of the key
+            s.collapse_arguments = False
+            assert s.normalize_signature(function='f3(s,t,u)') == 'f3(s, t, u)'
+            assert mocked_build.call_count == 2
+
+            # unhashable lines are normalized but not cached
+            assert s.normalize_signature(function='f', line=[1]) == 'f'
+            assert mocked_build.call_count == 3
+
     def test_generate_1(self):
         """test_generate_1: simple"""
         s = self.setup_config_c_sig_tool(['a', 'b', 'c'], ['d', 'e', 'f'])
@@ -155,6 +197,15 @@ class TestCSignatureTool:
         sig, notes = s.generate(a, hang_type=1)
         assert sig == 'chromehang | d | e | f | g'
 
+    def test_generate_stops_once_too_long(self):
+        s = self.setup_config_c_sig_tool(['a', 'b', 'c'], ['d', 'e', 'f'])
+        s.frame_classification_re = mock.Mock(wraps=s.frame_classification_re)
+        a = ['d' * 100, 'e' * 100, 'f' * 100, 'd', 'e', 'f', 'g']
+        sig, notes = s.generate(a)
+        assert sig == '%s | %s | %s...' % ('d' * 100, 'e' * 100, 'f' * 46)
+        assert notes == ['SignatureTool: signature truncated due to length']
+        assert s.frame_classification_re.match.call_count == 3
+
     def test_generate_2a(self):
         """test_generate_2a: way too long"""
         s = self.setup_config_c_sig_tool(['a', 'b', 'c'], ['d', 'e', 'f'])
@@ -245,6 +296,21 @@ class TestCSignatureTool:
         sig, notes = generator.generate(source_list)
         assert sig == 'foo32.dll | g'
 
+    def test_generate_frame_in_several_siglists(self):
+        # irrelevant wins over prefix, and a trimmed dll frame is checked
+        # against the prefix list after it's been trimmed
+        generator = self.setup_config_c_sig_tool(
+            ['ab.*'],
+            ['abc', 'foo32.dll$'],
+        )
+        source_list = (
+            'abc',
+            'foo32.dll@0x42',
+            'g',
+        )
+        sig, notes = generator.generate(source_list)
+        assert sig == 'foo32.dll | g'
+
 
 class TestJavaSignatureTool:
     def test_generate_signature_1(self):
@@ -968,6 +1034,34 @@ class TestSignatureGeneration:
         assert 'normalized' in frames_from_json_dump['frames'][0]
         assert frames_from_json_dump['frames'][0]['normalized'] == expected[0]
 
+    def test_create_frame_list_already_normalized(self):
+        sgr = SignatureGenerationRule()
+        thread = {
+            'frames': [
+                {'function': 'already(int)', 'normalized': 'already'},
+                {'function': 'fresh(int)'},
+                {'module': 'xul.dll', 'module_offset': '0x1'},
+            ]
+        }
+        c_signature_tool = sgr.c_signature_tool
+        with mock.patch.object(
+            c_signature_tool,
+            'normalize_signature',
+            wraps=c_signature_tool.normalize_signature
+        ) as mocked_normalize_signature:
+            with mock.patch.object(
+                c_signature_tool,
+                '_normalize_function',
+                wraps=c_signature_tool._normalize_function
+            ) as mocked_normalize_function:
+                frame_signatures_list = sgr._create_frame_list(thread)
+
+        assert frame_signatures_list == ['already', 'fresh', 'xul.dll@0x1']
+        assert mocked_normalize_function.call_count == 1
+        assert mocked_normalize_signature.call_count == 1
+        assert thread['frames'][1]['normalized'] == 'fresh'
+        assert thread['frames'][2]['normalized'] == 'xul.dll@0x1'
+
     def test_action_1(self):
         sgr = SignatureGenerationRule()
 
@@ -1283,6 +1377,18 @@ class TestAbortSignature:
         expected_sig = 'Abort | {}... | hello'.format('a' * 77)
         assert processed_crash['signature'] == expected_sig
 
+    def test_action_success_unicode_message(self):
+        rule = AbortSignature()
+        raw_crash = {
+            'AbortMessage': u'caf\xe9'
+        }
+        processed_crash = {
+            'signature': 'hello'
+        }
+        action_result = rule.action(raw_crash, processed_crash, [])
+        assert action_result is True
+        assert processed_crash['signature'] == u'Abort | caf\xe9 | hello'
+
     def test_action_success_remove_unwanted_parts(self):
         rule = AbortSignature()
 
@@ -6,11 +6,12 @@ v1/devguide#page
 """
 
 import logging
+import random
+import threading
 import uuid
 
 from raven.transport.threaded_requests import ThreadedRequestsHTTPTransport
 
-from django.contrib.sites.requests import RequestSite
 from django.conf import settings
 
 logger = logging.getLogger('crashstats:ga')
@@ -20,6 +21,44 @@ logger = logging.getLogger('crashstats:ga')
 # import sys
 # logger.addHandler(logging.StreamHandler(sys.stdout))
 
+_local = threading.local()
+
+
+def _get_cid():
+    """Return a random version 4 UUID, as hex, to use as the client ID.
+
+    uuid.uuid4() reads from os.urandom() on every call. A random.Random per
+    thread, seeded from os.urandom() once, is plenty for an anonymous
+    client ID.
+    """
+    try:
+        rng = _local.rng
+    except AttributeError:
+        rng = _local.rng = random.Random()
+    return uuid.UUID(int=rng.getrandbits(128), version=4).hex
+
+
+_transporter = None
+
+
+def _get_transporter():
+    """Return the transport used to send pageviews, creating it on first use.
+
+    Each ThreadedRequestsHTTPTransport starts its own worker thread, so one is
+    shared by all pageviews rather than making one per call.
+    """
+    global _transporter
+    if _transporter is None:
+        # NOTE(willkg): We pass in verify_ssl=False here because the version
+        # of openssl we have doesn't compute the certificate chain correctly
+        # and thus it fails to verify and then the SSL handshake fails.
+        # Because we're doing this, we removed any PII from the data ping.
+        _transporter = ThreadedRequestsHTTPTransport(
+            timeout=settings.GOOGLE_ANALYTICS_API_TIMEOUT,
+            verify_ssl=False
+        )
+    return _transporter
+
 
 def track_api_pageview(
     request,
@@ -29,6 +68,9 @@ def track_api_pageview(
 ):
     """Convenient wrapper function geared for the API calls. This way
     the page title is automatically guessed to something sensible."""
+    if not settings.GOOGLE_ANALYTICS_ID:
+        # Don't bother building the page title if nothing is tracked.
+        return
     page_title = page_title or 'API ({})'.format(request.path)
     track_pageview(
         request,
@@ -53,18 +95,22 @@ def track_pageview(
     :arg data_source: A string like 'web' or 'api'. See documentation.
 
     """
-    if not settings.GOOGLE_ANALYTICS_ID:
+    tracking_id = settings.GOOGLE_ANALYTICS_ID
+    if not tracking_id:
         logging.debug('GOOGLE_ANALYTICS_ID not set up. No pageview tracking.')
         return
 
-    domain = RequestSite(request).domain
+    # This is what RequestSite(request).domain would give, and
+    # request.build_absolute_uri() would look it up again.
+    domain = request.get_host()
 
-    params = {}
-    params['v'] = 1  # version
-    params['tid'] = settings.GOOGLE_ANALYTICS_ID  # Tracking ID / Property ID
-    params['dh'] = domain
-    params['t'] = 'pageview'
-    params['ds'] = data_source
+    params = {
+        'v': 1,  # version
+        'tid': tracking_id,  # Tracking ID / Property ID
+        'dh': domain,
+        't': 'pageview',
+        'ds': data_source,
+    }
 
     # Here's what the documentation says on
     # https://developers.google.com/analytics/devguides/collection/protocol\
@@ -79,20 +125,15 @@ def track_pageview(
     #   The value of this field should be a random UUID (version 4) as
     #   described in http://www.ietf.org/rfc/rfc4122.txt
     #
-    params['cid'] = uuid.uuid4().hex
+    params['cid'] = _get_cid()
 
     params['dp'] = request.path  # Page
-    params['dl'] = request.build_absolute_uri()
-    params['dt'] = page_title
-
-    # NOTE(willkg): We pass in verify_ssl=False here because the version of
-    # openssl we have doesn't compute the certificate chain correctly and thus
-    # it fails to verify and then the SSL handshake fails. Because we're doing
-    # this, we removed any PII from the data ping.
-    transporter = ThreadedRequestsHTTPTransport(
-        timeout=settings.GOOGLE_ANALYTICS_API_TIMEOUT,
-        verify_ssl=False
+    params['dl'] = '%s://%s%s' % (
+        request.scheme,
+        domain,
+        request.get_full_path()
     )
+    params['dt'] = page_title
 
     def success_cb():
         # Note! This will trigger as long as there's no python exception
@@ -113,7 +154,7 @@ def track_pageview(
         # success callback will be executed.
         logger.exception('Failed to send GA page tracking')
     try:
-        transporter.async_send(
+        _get_transporter().async_send(
             settings.GOOGLE_ANALYTICS_API_URL,
             params,
             headers,
@@ -13,21 +13,22 @@ from socorro.lib import BadArgumentError
 
 from crashstats.crashstats.models import ProductBuildTypes
 from crashstats.base.tests.testbase import DjangoTestCase
-from crashstats.base.ga import track_api_pageview, track_pageview
+from crashstats.base import ga
+from crashstats.base.ga import _get_cid, track_api_pageview, track_pageview
 
 
 EXPECTED_CID = 'ab8f0910428745d9995da0c51a9d3b64'
 
 
-def mock_uuid4(fun):
-    """Mock uuid.uuid4() decorator that returns a real non-random UUID"""
+def mock_cid(fun):
+    """Mock _get_cid() decorator that returns a non-random client ID"""
     @wraps(fun)
-    def _mock_uuid4(*args, **kwargs):
-        with mock.patch('uuid.uuid4') as mocked_uuid:
-            mocked_uuid.return_value = UUID(hex=EXPECTED_CID, version=4)
+    def _mock_cid(*args, **kwargs):
+        with mock.patch('crashstats.base.ga._get_cid') as mocked_get_cid:
+            mocked_get_cid.return_value = EXPECTED_CID
             return fun(*args, **kwargs)
 
-    return _mock_uuid4
+    return _mock_cid
 
 
 class TestTrackingPageviews(DjangoTestCase):
@@ -35,7 +36,27 @@ class TestTrackingPageviews(DjangoTestCase):
     in the tests to flip settings around.
     """
 
-    @mock_uuid4
+    def setUp(self):
+        super(TestTrackingPageviews, self).setUp()
+        # The transport holds on to its worker, so make sure each test gets
+        # a fresh one built with its own mocked AsyncWorker.
+        ga._transporter = None
+
+    def tearDown(self):
+        ga._transporter = None
+        super(TestTrackingPageviews, self).tearDown()
+
+    def test_get_cid(self):
+        cid = _get_cid()
+        eq_(UUID(hex=cid).version, 4)
+        eq_(UUID(hex=cid).hex, cid)
+        assert _get_cid() != cid
+
+    def test_transporter_is_shared(self):
+        transporter = ga._get_transporter()
+        assert ga._get_transporter() is transporter
+
+    @mock_cid
     @mock.patch('raven.transport.threaded_requests.AsyncWorker')
     @mock.patch('requests.post')
     @mock.patch('crashstats.base.ga.logger')
@@ -120,7 +141,7 @@ class TestTrackingPageviews(DjangoTestCase):
                 headers={}
             )
 
-    @mock_uuid4
+    @mock_cid
     @mock.patch('raven.transport.threaded_requests.AsyncWorker')
     @mock.patch('requests.post')
     @mock.patch('crashstats.base.ga.logger')
@@ -133,6 +154,10 @@ class TestTrackingPageviews(DjangoTestCase):
         request = RequestFactory().get('/api/SomeAPI/')
         request.user = AnonymousUser()
 
+        assert not settings.GOOGLE_ANALYTICS_ID  # the default
+        track_api_pageview(request)
+        assert not aw().queue.called
+
         with self.settings(GOOGLE_ANALYTICS_ID='XYZ-123'):
             track_api_pageview(request)
 
@@ -15,25 +15,29 @@ class SetRemoteAddrFromForwardedFor(object):
     trust the value of HTTP_X_FORWARDED_FOR.
     """
     def process_request(self, request):
+        meta = request.META
         try:
-            real_ip = request.META['HTTP_X_FORWARDED_FOR']
+            real_ip = meta['HTTP_X_FORWARDED_FOR']
         except KeyError:
             return None
         else:
             # HTTP_X_FORWARDED_FOR can be a comma-separated list of IPs. The
             # client's IP will be the first one.
-            real_ip = real_ip.split(',')[0].strip()
-            request.META['REMOTE_ADDR'] = real_ip
+            real_ip = real_ip.partition(',')[0].strip()
+            meta['REMOTE_ADDR'] = real_ip
 
 
 class Pretty400Errors(object):
 
     def process_response(self, request, response):
+        # Nearly every response isn't a 400, so get those out of the way
+        # before looking at the request or the headers.
+        if response.status_code != 400:
+            return response
 
         if (
-            response.status_code == 400 and
             not request.is_ajax() and
-            response['Content-Type'].startswith('text/html')
+            response.get('Content-Type', '').startswith('text/html')
         ):
             return render(
                 request,
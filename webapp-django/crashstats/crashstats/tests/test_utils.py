@@ -541,6 +541,8 @@ class TestUtils(TestCase):
         response = func(request)
         ok_(isinstance(response, HttpResponse))
         eq_(json.loads(response.content), {'one': 'One'})
+        # not indented unless asked for
+        eq_(json.dumps({'one': 'One'}), response.content)
         eq_(response.status_code, 200)
 
     def test_json_view_indented(self):
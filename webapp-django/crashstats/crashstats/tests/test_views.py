@@ -1652,12 +1652,12 @@ class TestViews(BaseTestViews):
 
         # also, check that the other links are there
         foo_dmp_url = reverse(
-            'crashstats:raw_data_named',
+            'crashstats:raw_data',
             args=(crash_id, 'upload_file_minidump_foo', 'dmp')
         )
         ok_(foo_dmp_url in response.content)
         bar_dmp_url = reverse(
-            'crashstats:raw_data_named',
+            'crashstats:raw_data',
             args=(crash_id, 'upload_file_minidump_bar', 'dmp')
         )
         ok_(bar_dmp_url in response.content)
@@ -2536,7 +2536,7 @@ class TestViews(BaseTestViews):
         models.RawCrash.implementation().get.side_effect = mocked_get
 
         dump_url = reverse(
-            'crashstats:raw_data_named',
+            'crashstats:raw_data',
             args=(crash_id, 'memory_report', 'json.gz')
         )
         response = self.client.get(dump_url)
@@ -2553,6 +2553,12 @@ class TestViews(BaseTestViews):
         eq_(response['Content-Type'], 'application/octet-stream')
         ok_('binary stuff' in response.content, response.content)
 
+        # only the memory report is served as json.gz
+        response = self.client.get(
+            reverse('crashstats:raw_data', args=(crash_id, 'json.gz'))
+        )
+        eq_(response.status_code, 404)
+
     def test_unauthenticated_user_redirected_from_protected_page(self):
         url = reverse(
             'crashstats:exploitability_report',
@@ -8,6 +8,7 @@ from . import views
 products = r'/products/(?P<product>\w+)'
 versions = r'/versions/(?P<versions>[;\w\.()]+)'
 version = r'/versions/(?P<version>[;\w\.()]+)'
+crash_id = r'(?P<crash_id>[0-9a-fA-F-]{36})'
 
 perm_legacy_redirect = settings.PERMANENT_LEGACY_REDIRECTS
 
@@ -40,11 +41,8 @@ urlpatterns = patterns(
         name='quick_search'),
     url(r'^buginfo/bug', views.buginfo,
         name='buginfo'),
-    url(r'^rawdumps/(?P<crash_id>[\w-]{36})-(?P<name>\w+)\.'
+    url(r'^rawdumps/' + crash_id + r'(?:-(?P<name>\w+))?\.'
         r'(?P<extension>json|dmp|json\.gz)$',
-        views.raw_data,
-        name='raw_data_named'),
-    url(r'^rawdumps/(?P<crash_id>[\w-]{36}).(?P<extension>json|dmp)$',
         views.raw_data,
         name='raw_data'),
     url(r'^login/$',
@@ -48,7 +48,10 @@ def json_view(f):
             return response
         else:
 
-            indent = 0
+            # Leave indent as None unless asked to pretty print. Any other
+            # value (even 0) makes the json module fall back to its much
+            # slower pure Python encoder.
+            indent = None
             request_data = (
                 request.method == 'GET' and request.GET or request.POST
             )
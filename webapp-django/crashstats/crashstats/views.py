@@ -938,7 +938,7 @@ def report_index(request, crash_id, default_context=None):
                 name = 'upload_file_minidump_%s' % (suffix,)
                 context['raw_dump_urls'].append(
                     reverse(
-                        'crashstats:raw_data_named',
+                        'crashstats:raw_data',
                         args=(crash_id, name, 'dmp')
                     )
                 )
@@ -949,7 +949,7 @@ def report_index(request, crash_id, default_context=None):
         ):
             context['raw_dump_urls'].append(
                 reverse(
-                    'crashstats:raw_data_named',
+                    'crashstats:raw_data',
                     args=(crash_id, 'memory_report', 'json.gz')
                 )
             )
@@ -1086,7 +1086,8 @@ def raw_data(request, crash_id, extension, name=None):
         format = 'raw'
         content_type = 'application/octet-stream'
     else:
-        raise NotImplementedError(extension)
+        # e.g. a json.gz that isn't a memory report
+        raise http.Http404(extension)
 
     data = api.get(crash_id=crash_id, format=format, name=name)
     response = http.HttpResponse(content_type=content_type)
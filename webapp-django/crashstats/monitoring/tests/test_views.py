@@ -26,6 +26,7 @@ class TestViews(BaseTestViews):
 
 
 class TestCrashAnalysisHealthViews(BaseTestViews):
+    base_url = reverse('monitoring:crash_analysis_health')
 
     @mock.patch('requests.get')
     def test_all_good(self, rget):
@@ -38,8 +39,7 @@ class TestCrashAnalysisHealthViews(BaseTestViews):
 
         rget.side_effect = mocked_get
         assert settings.CRASH_ANALYSIS_MONITOR_DAYS_BACK == 2
-        url = reverse('monitoring:crash_analysis_health')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'ALLGOOD')
@@ -60,8 +60,7 @@ class TestCrashAnalysisHealthViews(BaseTestViews):
             """)
 
         rget.side_effect = mocked_get
-        url = reverse('monitoring:crash_analysis_health')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'ALLGOOD')
@@ -76,8 +75,7 @@ class TestCrashAnalysisHealthViews(BaseTestViews):
             return Response('Not found', 404)
 
         rget.side_effect = mocked_get
-        url = reverse('monitoring:crash_analysis_health')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'Broken')
@@ -96,8 +94,7 @@ class TestCrashAnalysisHealthViews(BaseTestViews):
             """)
 
         rget.side_effect = mocked_get
-        url = reverse('monitoring:crash_analysis_health')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'ALLGOOD')
@@ -115,8 +112,7 @@ class TestCrashAnalysisHealthViews(BaseTestViews):
             """)
 
         rget.side_effect = mocked_get
-        url = reverse('monitoring:crash_analysis_health')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'Broken')
@@ -125,6 +121,7 @@ class TestCrashAnalysisHealthViews(BaseTestViews):
 
 
 class TestCrontabberStatusViews(BaseTestViews):
+    base_url = reverse('monitoring:crontabber_status')
 
     def test_crontabber_status_ok(self):
 
@@ -142,8 +139,7 @@ class TestCrontabberStatusViews(BaseTestViews):
 
         CrontabberState.implementation().get.side_effect = mocked_get
 
-        url = reverse('monitoring:crontabber_status')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         eq_(json.loads(response.content), {'status': 'ALLGOOD'})
 
@@ -178,14 +174,46 @@ class TestCrontabberStatusViews(BaseTestViews):
 
         CrontabberState.implementation().get.side_effect = mocked_get
 
-        url = reverse('monitoring:crontabber_status')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'Broken')
         eq_(data['broken'], ['job1'])
         eq_(data['blocked'], ['job2', 'job3'])
 
+    def test_crontabber_status_blocked_deep(self):
+
+        def mocked_get(**options):
+            recently = timezone.now()
+            depends_on = {
+                'job1': [],
+                'job2': ['job1'],
+                'job3': ['job2'],
+                'job4': ['job3'],
+                'job5': ['job2', 'job4'],
+                'job6': [],
+            }
+            return {
+                'state': dict(
+                    (name, {
+                        'error_count': int(name == 'job1'),
+                        'depends_on': dependencies,
+                        'last_run': recently,
+                    })
+                    for name, dependencies in depends_on.items()
+                )
+            }
+
+        CrontabberState.implementation().get.side_effect = mocked_get
+
+        response = self.client.get(self.base_url)
+        eq_(response.status_code, 200)
+        data = json.loads(response.content)
+        eq_(data['status'], 'Broken')
+        eq_(data['broken'], ['job1'])
+        # every job downstream of job1 is listed exactly once
+        eq_(sorted(data['blocked']), ['job2', 'job3', 'job4', 'job5'])
+
     def test_crontabber_status_not_run_for_a_while(self):
 
         some_time_ago = (
@@ -212,8 +240,7 @@ class TestCrontabberStatusViews(BaseTestViews):
 
         CrontabberState.implementation().get.side_effect = mocked_get
 
-        url = reverse('monitoring:crontabber_status')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'Stale')
@@ -228,18 +255,17 @@ class TestCrontabberStatusViews(BaseTestViews):
 
         CrontabberState.implementation().get.side_effect = mocked_get
 
-        url = reverse('monitoring:crontabber_status')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         data = json.loads(response.content)
         eq_(data['status'], 'Stale')
 
 
 class TestHealthcheckViews(BaseTestViews):
+    base_url = reverse('monitoring:healthcheck')
 
     def test_healthcheck_elb(self):
-        url = reverse('monitoring:healthcheck')
-        response = self.client.get(url, {'elb': 'true'})
+        response = self.client.get(self.base_url, {'elb': 'true'})
         eq_(response.status_code, 200)
         eq_(json.loads(response.content)['ok'], True)
 
@@ -248,7 +274,7 @@ class TestHealthcheckViews(BaseTestViews):
         self.assertNumQueries(
             0,
             self.client.get,
-            url,
+            self.base_url,
             {'elb': 'true'}
         )
 
@@ -280,8 +306,7 @@ class TestHealthcheckViews(BaseTestViews):
 
         rget.side_effect = mocked_requests_get
 
-        url = reverse('monitoring:healthcheck')
-        response = self.client.get(url)
+        response = self.client.get(self.base_url)
         eq_(response.status_code, 200)
         eq_(json.loads(response.content)['ok'], True)
 
@@ -1,3 +1,4 @@
+import collections
 import datetime
 import urlparse
 
@@ -119,23 +120,24 @@ def crontabber_status(request):
         name for name, state in all_apps.items()
         if state['error_count']
     ]
-    blocked = [
-        name for name, state in all_apps.items()
-        if set(broken) & set(state['depends_on'])
-    ]
 
-    # This infinite loop recurses deeper and deeper into the structure
-    # to find all jobs that are blocked. If we find that job X is blocked
-    # by job Y in iteration 1, we need to do another iteration to see if
-    # there are jobs that are blocked by job X (which was blocked by job Y)
-    while True:
-        also_blocked = [
-            name for name, state in all_apps.items()
-            if name not in blocked and set(blocked) & set(state['depends_on'])
-        ]
-        if not also_blocked:
-            break
-        blocked += also_blocked
+    # Map each job to the jobs that depend on it, then walk downstream
+    # from the broken jobs. Everything reached, however indirectly, is
+    # blocked.
+    successors = collections.defaultdict(list)
+    for name, state in all_apps.items():
+        for dependency in state['depends_on']:
+            successors[dependency].append(name)
+
+    blocked = []
+    seen = set()
+    queue = collections.deque(broken)
+    while queue:
+        for name in successors[queue.popleft()]:
+            if name not in seen:
+                seen.add(name)
+                blocked.append(name)
+                queue.append(name)
 
     if broken:
         # let's change our mind
@@ -178,10 +178,13 @@ class TestViews(BaseTestViews):
         })
         eq_(response.status_code, 200)
 
-        response = self.client.get(self.base_url, {
-            'product': 'WaterWolf',
-            'version': '19.0',
-        })
+        # The only ORM query made while rendering is the one for the
+        # status messages shown in the base template.
+        with self.assertNumQueries(1):
+            response = self.client.get(self.base_url, {
+                'product': 'WaterWolf',
+                'version': '19.0',
+            })
         eq_(response.status_code, 200)
         doc = pyquery.PyQuery(response.content)
         selected_count = doc('.tc-result-count a[class="selected"]')
@@ -7,6 +7,7 @@ from django.shortcuts import redirect, render
 from django.utils import timezone
 from django.utils.http import urlquote
 
+from concurrent.futures import ThreadPoolExecutor
 from session_csrf import anonymous_csrf
 
 from crashstats.crashstats import models
@@ -19,13 +20,29 @@ from crashstats.supersearch.utils import get_date_boundaries
 from crashstats.topcrashers.forms import TopCrashersForm
 
 
+# settings.PROCESS_TYPES might contain tuple to indicate that some
+# are actual labels. Neither of these change at runtime, so they are
+# worked out once rather than on every request.
+PROCESS_TYPE_NAMES = frozenset(
+    option[0] if isinstance(option, (list, tuple)) else option
+    for option in settings.PROCESS_TYPES
+)
+PROCESS_TYPE_VALUES = tuple(
+    tuple(option) if isinstance(option, (list, tuple))
+    else (option, option.capitalize())
+    for option in settings.PROCESS_TYPES
+    if option != 'all'
+)
+
+
 def datetime_to_build_id(date):
     """Return a build_id-like string from a datetime. """
     return date.strftime('%Y%m%d%H%M%S')
 
 
-def get_topcrashers_results(**kwargs):
-    """Return the results of a search. """
+def get_topcrashers_results(platforms=None, **kwargs):
+    """Return the results of a search. Pass `platforms` if the list of
+    platforms has already been fetched, to avoid fetching it again. """
     results = []
 
     params = kwargs
@@ -55,13 +72,40 @@ def get_topcrashers_results(**kwargs):
             '<' + datetime_to_build_id(dates[1])
         ]
 
+    # Run the same query but for the previous date range, so we can
+    # compare the rankings and show rank changes.
+    delta = (dates[1] - dates[0]) * 2
+    previous_params = dict(params)
+    previous_params['date'] = [
+        '>=' + (dates[1] - delta).isoformat(),
+        '<' + dates[0].isoformat()
+    ]
+    previous_params['_aggs.signature'] = [
+        'platform',
+    ]
+    previous_params['_facets_size'] = params['_facets_size'] * 2
+
+    if range_type == 'build':
+        previous_params['date'][1] = '<' + dates[1].isoformat()
+        previous_params['build_id'] = [
+            '>=' + datetime_to_build_id(dates[1] - delta),
+            '<' + datetime_to_build_id(dates[0])
+        ]
+
     api = SuperSearchUnredacted()
-    search_results = api.get(**params)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # The previous range is only needed if the current one has results,
+        # but both queries are independent, so send them at the same time
+        # rather than waiting for one before starting the other.
+        previous_range_future = executor.submit(api.get, **previous_params)
+        search_results = api.get(**params)
+        previous_range_results = previous_range_future.result()
 
     if search_results['total'] > 0:
         results = search_results['facets']['signature']
 
-        platforms = models.Platforms().get_all()['hits']
+        if platforms is None:
+            platforms = models.Platforms().get_all()['hits']
         platform_codes = [
             x['code'] for x in platforms if x['code'] != 'unknown'
         ]
@@ -129,48 +173,28 @@ def get_topcrashers_results(**kwargs):
                 hit['facets']['cardinality_install_time']['value']
             )
 
-        # Run the same query but for the previous date range, so we can
-        # compare the rankings and show rank changes.
-        delta = (dates[1] - dates[0]) * 2
-        params['date'] = [
-            '>=' + (dates[1] - delta).isoformat(),
-            '<' + dates[0].isoformat()
-        ]
-        params['_aggs.signature'] = [
-            'platform',
-        ]
-        params['_facets_size'] *= 2
-
-        if range_type == 'build':
-            params['date'][1] = '<' + dates[1].isoformat()
-            params['build_id'] = [
-                '>=' + datetime_to_build_id(dates[1] - delta),
-                '<' + datetime_to_build_id(dates[0])
-            ]
+        # The previous range is fetched with twice as many signatures, but
+        # only those also in the current results are ever looked at, so
+        # compare against those directly rather than building an entry for
+        # every previous signature.
+        hits_by_signature = {}
+        for hit in results:
+            hit['diff'] = 'new'
+            hit['rank_diff'] = 0
+            hit['previous_percent'] = 0
+            hits_by_signature[hit['term']] = hit
 
-        previous_range_results = api.get(**params)
         total = previous_range_results['total']
-
-        compare_signatures = {}
         if total > 0 and 'signature' in previous_range_results['facets']:
             signatures = previous_range_results['facets']['signature']
-            for i, hit in enumerate(signatures):
-                compare_signatures[hit['term']] = {
-                    'count': hit['count'],
-                    'rank': i + 1,
-                    'percent': 100.0 * hit['count'] / total
-                }
-
-        for hit in results:
-            sig = compare_signatures.get(hit['term'])
-            if sig:
-                hit['diff'] = sig['percent'] - hit['percent']
-                hit['rank_diff'] = sig['rank'] - hit['rank']
-                hit['previous_percent'] = sig['percent']
-            else:
-                hit['diff'] = 'new'
-                hit['rank_diff'] = 0
-                hit['previous_percent'] = 0
+            for i, previous_hit in enumerate(signatures):
+                hit = hits_by_signature.get(previous_hit['term'])
+                if hit is None:
+                    continue
+                percent = 100.0 * previous_hit['count'] / total
+                hit['diff'] = percent - hit['percent']
+                hit['rank_diff'] = i + 1 - hit['rank']
+                hit['previous_percent'] = percent
 
     return search_results
 
@@ -203,36 +227,30 @@ def topcrashers(request, days=None, possible_days=None, default_context=None):
 
     context['product'] = product
 
-    if not versions:
+    active_versions = context['active_versions'][product]
+
+    if not versions and active_versions:
         # :(
         # simulate what the nav.js does which is to take the latest version
-        # for this product.
-        for pv in context['active_versions'][product]:
-            if pv['is_featured']:
-                url = '%s&version=%s' % (
-                    request.build_absolute_uri(), urlquote(pv['version'])
-                )
-                return redirect(url)
-        if context['active_versions'][product]:
-            # Not a single version was featured, but there were active
-            # versions. In this case, use the first available
-            # *active* version.
-            for pv in context['active_versions'][product]:
-                url = '%s&version=%s' % (
-                    request.build_absolute_uri(), urlquote(pv['version'])
-                )
-                return redirect(url)
+        # for this product. If not a single version is featured, use the
+        # first available *active* version.
+        pv = next(
+            (pv for pv in active_versions if pv['is_featured']),
+            active_versions[0]
+        )
+        url = '%s&version=%s' % (
+            request.build_absolute_uri(), urlquote(pv['version'])
+        )
+        return redirect(url)
 
     # See if all versions support builds. If not, refuse to show the "by build"
     # range option in the UI.
-    versions_have_builds = True
-    for version in versions:
-        for pv in context['active_versions'][product]:
-            if pv['version'] == version and not pv['has_builds']:
-                versions_have_builds = False
-                break
-
-    context['versions_have_builds'] = versions_have_builds
+    versions_without_builds = set(
+        pv['version'] for pv in active_versions if not pv['has_builds']
+    )
+    context['versions_have_builds'] = not versions_without_builds.intersection(
+        versions
+    )
 
     # Used to pick a version in the dropdown menu.
     context['version'] = versions[0]
@@ -244,15 +262,7 @@ def topcrashers(request, days=None, possible_days=None, default_context=None):
             hour=0, minute=0, second=0, microsecond=0
         )
 
-    # settings.PROCESS_TYPES might contain tuple to indicate that some
-    # are actual labels.
-    process_types = []
-    for option in settings.PROCESS_TYPES:
-        if isinstance(option, (list, tuple)):
-            process_types.append(option[0])
-        else:
-            process_types.append(option)
-    if crash_type not in process_types:
+    if crash_type not in PROCESS_TYPE_NAMES:
         crash_type = 'browser'
 
     context['crash_type'] = crash_type
@@ -285,6 +295,7 @@ def topcrashers(request, days=None, possible_days=None, default_context=None):
     }
 
     api_results = get_topcrashers_results(
+        platforms=operating_systems,
         product=product,
         version=versions,
         platform=os_name,
@@ -298,13 +309,15 @@ def topcrashers(request, days=None, possible_days=None, default_context=None):
     )
 
     if api_results['total'] > 0:
-        tcbs = api_results['facets']['signature']
+        # Only the first result_count signatures are ever shown, so there
+        # is no point augmenting the rest.
+        tcbs = api_results['facets']['signature'][:int(result_count)]
     else:
         tcbs = []
 
     count_of_included_crashes = 0
     signatures = []
-    for crash in tcbs[:int(result_count)]:
+    for crash in tcbs:
         signatures.append(crash['signature'])
         count_of_included_crashes += crash['count']
 
@@ -313,70 +326,47 @@ def topcrashers(request, days=None, possible_days=None, default_context=None):
         100.0 * count_of_included_crashes / api_results['total']
     )
 
-    # Get augmented bugs data.
+    # Get augmented bugs and signature data. Neither lookup depends on the
+    # other, so they are made at the same time.
     bugs = defaultdict(list)
+    sig_date_data = {}
     if signatures:
         bugs_api = models.Bugs()
-        for b in bugs_api.get(signatures=signatures)['hits']:
+        sig_api = models.SignatureFirstDate()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            # SignatureFirstDate().get_dates() is an optimized version
+            # of SignatureFirstDate().get() that returns a dict of
+            # signature --> dates.
+            first_dates_future = executor.submit(sig_api.get_dates, signatures)
+            bugs_hits = bugs_api.get(signatures=signatures)['hits']
+            first_dates = first_dates_future.result()
+
+        for b in bugs_hits:
             bugs[b['signature']].append(b['id'])
 
-    # Get augmented signature data.
-    sig_date_data = {}
-    if signatures:
-        sig_api = models.SignatureFirstDate()
-        # SignatureFirstDate().get_dates() is an optimized version
-        # of SignatureFirstDate().get() that returns a dict of
-        # signature --> dates.
-        first_dates = sig_api.get_dates(signatures)
         for sig, dates in first_dates.items():
             sig_date_data[sig] = dates['first_date']
 
     for crash in tcbs:
-        crash_counts = []
-        # Due to the inconsistencies of OS usage and naming of
-        # codes and props for operating systems the hacky bit below
-        # is required. Socorro and the world will be a better place
-        # once https://bugzilla.mozilla.org/show_bug.cgi?id=790642 lands.
-        for operating_system in operating_systems:
-            if operating_system['name'] == 'Unknown':
-                # not applicable in this context
-                continue
-            os_code = operating_system['code'][0:3].lower()
-            key = '%s_count' % os_code
-            crash_counts.append([crash[key], operating_system['name']])
-
         sig = crash['signature']
 
-        # Augment with bugs.
+        # Augment with bugs, most recent first. The signature facets from
+        # SuperSearch never come with bugs of their own, so there is
+        # nothing to merge with.
         if sig in bugs:
-            if 'bugs' in crash:
-                crash['bugs'].extend(bugs[sig])
-            else:
-                crash['bugs'] = bugs[sig]
+            crash['bugs'] = sorted(bugs[sig], reverse=True)
 
         # Augment with first appearance dates.
         if sig in sig_date_data:
             crash['first_report'] = sig_date_data[sig]
 
-        if 'bugs' in crash:
-            crash['bugs'].sort(reverse=True)
-
     context['tcbs'] = tcbs
     context['days'] = days
     context['report'] = 'topcrasher'
     context['possible_days'] = possible_days
     context['total_crashing_signatures'] = len(signatures)
     context['total_number_of_crashes'] = api_results['total']
-    context['process_type_values'] = []
-    for option in settings.PROCESS_TYPES:
-        if option == 'all':
-            continue
-        if isinstance(option, (list, tuple)):
-            value, label = option
-        else:
-            value = option
-            label = option.capitalize()
-        context['process_type_values'].append((value, label))
+    context['process_type_values'] = PROCESS_TYPE_VALUES
 
     context['platform_values'] = settings.DISPLAY_OS_NAMES
 